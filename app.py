@@ -1,12 +1,57 @@
-import os, json, base64, textwrap, time, datetime as dt
-from typing import Any, Dict, List
-import streamlit as st, requests, pandas as pd
-import tempfile, webbrowser
+import os, io, re, json, hashlib, hmac, sqlite3, threading, time, datetime as dt
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+import streamlit as st, requests, orjson
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from urllib3.util.retry import Retry
+
+from prompts import (
+    VAPI_ASSISTANT_DEFAULTS,
+    build_extraction_prompt,
+    create_interview_html,
+    render_interview_prompt,
+)
 
 # App Configuration
 APP_TITLE = "Drishti UPSC Mock Interview"
 APP_SUBTITLE = "Secure AI-Powered Interview Platform"
 VAPI_BASE_URL = "https://api.vapi.ai"
+GIST_RAW_HOST = "https://gist.githubusercontent.com/"
+# Opt-in only (USE_GIST_CDN): githack's production CDN caches files permanently, so a candidate page
+# served from it (name, roll number) outlives deletion of the secret gist; htmlpreview keeps no copy
+GIST_CDN_HOST = "https://gistcdn.githack.com/"
+HTTP_TIMEOUT = (5, 30)  # (connect, read) seconds
+POLL_TIMEOUT = (5, 10)  # shorter read timeout for VAPI polls that run on the script thread
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+_FOOTER_HTML = """
+<div style="text-align: center; padding: 20px; background: linear-gradient(135deg, #667eea, #764ba2); border-radius: 15px; color: white;">
+    <h4>© Drishti AI Team | Secure UPSC Mock Interview Platform</h4>
+    <p>🔒 All interviews are encrypted and analyzed securely</p>
+    <p>📞 Technical Support: support@drishti.ai</p>
+</div>
+"""
+
+# JSON helpers
+def to_pretty_json(data: Any) -> str:
+    """Serialize data as 2-space indented JSON, preserving non-ASCII text"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+# Model output parsing
+_CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+_JSON_DECODER = json.JSONDecoder()
+_JSON_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+def parse_model_json(text: str) -> Dict[str, Any]:
+    """Parse a JSON object from model output, tolerating fences or surrounding prose"""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        text = _CODE_FENCE_RE.sub("", text.strip())
+        data, _ = _JSON_DECODER.raw_decode(text, max(text.find("{"), 0))
+        return data
 
 # Load environment variables
 try:
@@ -22,12 +67,17 @@ def get_secret(key: str, default: str = "") -> str:
     except Exception:
         return os.getenv(key, default)
 
+def hash_password(password: str) -> bytes:
+    """Digest a password so only hashes are kept and compared"""
+    return hashlib.blake2b(password.encode(), digest_size=32).digest() if password else b""
+
 # Get all secrets
-APP_PASSWORD = get_secret("APP_PASSWORD", "")
+APP_PASSWORD_HASH = hash_password(get_secret("APP_PASSWORD", ""))
 VAPI_API_KEY = get_secret("VAPI_API_KEY", "")
 VAPI_PUBLIC_KEY = get_secret("VAPI_PUBLIC_KEY", "")
 GEMINI_API_KEY = get_secret("GEMINI_API_KEY", "")
 GITHUB_TOKEN = get_secret("GITHUB_TOKEN", "")
+USE_GIST_CDN = str(get_secret("USE_GIST_CDN", "")).lower() in ("1", "true", "yes")
 
 # Page configuration
 st.set_page_config(
@@ -47,6 +97,46 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Persisted assistants
+# Only ids, names and prompt hashes are stored; the extracted DAF data (PII) is never written here
+@st.cache_resource
+def get_assistant_db() -> Tuple[sqlite3.Connection, threading.Lock]:
+    """Open the on-disk assistant registry shared by all sessions, with the lock that serializes its use"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    con = sqlite3.connect(os.path.join(CACHE_DIR, "assistants.db"), check_same_thread=False)
+    con.execute(
+        "CREATE TABLE IF NOT EXISTS assistants ("
+        "roll_no TEXT PRIMARY KEY, assistant_id TEXT, name TEXT, prompt_hash TEXT, created_at TEXT)"
+    )
+    return con, threading.Lock()
+
+def load_saved_assistants() -> Dict[str, Dict[str, Any]]:
+    """Load assistants created in earlier sessions, keyed by roll number"""
+    try:
+        con, lock = get_assistant_db()
+        with lock:
+            rows = con.execute("SELECT roll_no, assistant_id, name, prompt_hash FROM assistants").fetchall()
+    except (OSError, sqlite3.Error):
+        return {}
+    return {
+        str(roll_no): {"assistant_id": assistant_id, "name": name, "prompt_hash": prompt_hash}
+        for roll_no, assistant_id, name, prompt_hash in rows
+    }
+
+def save_assistant(roll_no: str, info: Dict[str, Any]):
+    """Persist an assistant so a reload or restart does not recreate it"""
+    try:
+        con, lock = get_assistant_db()
+        with lock, con:
+            con.execute(
+                "INSERT OR REPLACE INTO assistants (roll_no, assistant_id, name, prompt_hash, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (str(roll_no), info["assistant_id"], info["name"], info["prompt_hash"],
+                 dt.datetime.now(dt.timezone.utc).isoformat())
+            )
+    except (OSError, sqlite3.Error):
+        pass
+
 # Initialize session state
 def initialize_session_state():
     """Initialize all session state variables"""
@@ -54,8 +144,10 @@ def initialize_session_state():
         st.session_state.authenticated = False
     if "candidate_json" not in st.session_state:
         st.session_state.candidate_json = None
+    if "candidate_json_text" not in st.session_state:
+        st.session_state.candidate_json_text = ""
     if "assistants" not in st.session_state:
-        st.session_state.assistants = {}
+        st.session_state.assistants = load_saved_assistants()
     if "current_candidate" not in st.session_state:
         st.session_state.current_candidate = None
     if "interview_started_at" not in st.session_state:
@@ -64,13 +156,29 @@ def initialize_session_state():
         st.session_state.interview_status = "idle"
     if "deployed_interview" not in st.session_state:
         st.session_state.deployed_interview = None
+    if "browser_opened_for" not in st.session_state:
+        st.session_state.browser_opened_for = None
+    if "prepared_downloads" not in st.session_state:
+        st.session_state.prepared_downloads = {}
+    if "feedback_requested" not in st.session_state:
+        st.session_state.feedback_requested = None
+    if "last_call_details" not in st.session_state:
+        st.session_state.last_call_details = None
+    if "feedback_by_roll_no" not in st.session_state:
+        st.session_state.feedback_by_roll_no = []
+    if "assistant_job" not in st.session_state:
+        st.session_state.assistant_job = None
+    if "assistant_job_result" not in st.session_state:
+        st.session_state.assistant_job_result = None
+    if "download_timestamp" not in st.session_state:
+        st.session_state.download_timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M")
 
 initialize_session_state()
 
 # Authentication
 def authenticate():
     """Handle password authentication"""
-    if not APP_PASSWORD:
+    if not APP_PASSWORD_HASH:
         st.error("Application password not configured in secrets.")
         st.stop()
     
@@ -80,7 +188,7 @@ def authenticate():
     password = st.text_input("Enter access password:", type="password")
     
     if st.button("Login", type="primary"):
-        if password == APP_PASSWORD:
+        if hmac.compare_digest(hash_password(password), APP_PASSWORD_HASH):
             st.session_state.authenticated = True
             st.success("Authentication successful!")
             st.rerun()
@@ -121,84 +229,194 @@ def check_api_configuration():
 if not check_api_configuration():
     st.stop()
 
+# HTTP Sessions
+def _pooled_session(headers: Dict[str, str]) -> requests.Session:
+    """Create a keep-alive session with connection pooling and default headers"""
+    session = requests.Session()
+    # Retries cover connection failures and 5xx replies only: read timeouts are not retried (read=0),
+    # Retry-After is ignored and 429s are left to the VAPI circuit breaker. A stalled read therefore
+    # costs one read timeout, and 5xx retries add at most 0.5 + 1 + 2 s of backoff.
+    retries = Retry(
+        total=3, read=0, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504],
+        respect_retry_after_header=False, raise_on_status=False
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retries))
+    session.headers.update(headers)
+    return session
+
+@st.cache_resource
+def get_vapi_session() -> requests.Session:
+    """Shared Vapi session with auth headers pre-set"""
+    return _pooled_session({
+        "Authorization": f"Bearer {VAPI_API_KEY}",
+        "Content-Type": "application/json"
+    })
+
+@st.cache_resource
+def get_github_session() -> requests.Session:
+    """Shared GitHub session with auth headers pre-set"""
+    return _pooled_session({
+        "Authorization": f"token {GITHUB_TOKEN}",
+        "Accept": "application/vnd.github.v3+json",
+        "Content-Type": "application/json"
+    })
+
 # Gemini Client
-_GEMINI_CLIENT = None
+@st.cache_resource
+def get_genai(api_key: str):
+    """Import and configure the Gemini SDK once per API key"""
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai
 
-def get_gemini_client():
-    """Initialize Gemini client"""
-    global _GEMINI_CLIENT
-    if _GEMINI_CLIENT is None:
-        import google.generativeai as genai
-        genai.configure(api_key=GEMINI_API_KEY)
-        _GEMINI_CLIENT = genai
-    return _GEMINI_CLIENT
+@st.cache_resource
+def get_gemini_model(api_key: str, model_name: str = "gemini-1.5-flash"):
+    """Return a cached Gemini model handle"""
+    return get_genai(api_key).GenerativeModel(model_name)
+
+@st.cache_resource
+def get_gemini_uploads() -> Dict[str, Any]:
+    """Shared Files API handles keyed by DAF content hash"""
+    return {}
+
+GEMINI_PROCESSING_TIMEOUT = 120  # seconds
+
+def upload_daf_file(f: Dict[str, Any]):
+    """Upload a DAF file to the Gemini Files API, reusing live handles by content hash"""
+    uploads = get_gemini_uploads()
+    key = f["sha256"]
+    uploaded = uploads.get(key)
+    # Files API uploads expire after 48 hours; re-upload shortly before that
+    fresh_until = dt.datetime.now(dt.timezone.utc) + dt.timedelta(minutes=10)
+    if uploaded is None or uploaded.expiration_time <= fresh_until:
+        genai = get_genai(GEMINI_API_KEY)
+        f["file"].seek(0)
+        uploaded = genai.upload_file(f["file"], mime_type=f["mime_type"], display_name=f["filename"])
+        deadline = time.monotonic() + GEMINI_PROCESSING_TIMEOUT
+        while uploaded.state.name == "PROCESSING":
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{f['filename']} is still processing after {GEMINI_PROCESSING_TIMEOUT} seconds")
+            time.sleep(1)
+            uploaded = genai.get_file(uploaded.name)
+        # Only ACTIVE handles are shared; a FAILED upload must not block later attempts
+        if uploaded.state.name != "ACTIVE":
+            raise RuntimeError(f"Gemini could not process {f['filename']} (state: {uploaded.state.name})")
+        uploads[key] = uploaded
+    return uploaded
 
 def extract_candidate_json(files: List[Dict[str, Any]], reg_no: str) -> Dict[str, Any]:
     """Extract candidate information from DAF files using Gemini"""
-    genai = get_gemini_client()
-    model = genai.GenerativeModel("gemini-1.5-flash")
+    model = get_gemini_model(GEMINI_API_KEY)
     
-    schema = {
-        "name": "string", "roll_no": "string", "dob": "string", "gender": "string",
-        "community": "string", "religion": "string", "mother_tongue": "string",
-        "birth_place": "string", "home_city": "string", "marital_status": "string",
-        "employment_status": "string", "number_of_attempts": "integer",
-        "service_preferences": "array", "cadre_preferences": "array",
-        "assets": "string", "education": "object", "optional_subject": "string",
-        "language_medium": "string", "hobbies": "array", "achievements": "array",
-        "parents": "object", "address": "object", "email": "string", "phone": "string",
-        "work_experience": "array", "positions_of_responsibility": "array",
-        "extracurriculars": "array", "sports": "array", "certifications": "array",
-        "awards": "array", "languages_known": "array",
-        "preferred_languages_for_interview": "array", "coaching": "string",
-        "career_gap_explanations": "string", "notable_projects": "array",
-        "publications": "array", "social_work": "array", "disciplinary_actions": "string"
-    }
+    sys_prompt = build_extraction_prompt(reg_no)
     
-    sys_prompt = f"""You are an expert UPSC DAF parser. Extract a single JSON from DAF-1 and DAF-2 following this schema:
-{json.dumps(schema, indent=2)}
+    # Uploads stay sequential: the SDK's default file client wraps a single httplib2.Http, which is not thread-safe
+    parts = [sys_prompt] + [upload_daf_file(f) for f in files]
 
-Candidate roll/registration no.: {reg_no or 'UNKNOWN'}
-
-Rules:
-- Return valid JSON only
-- Populate all available fields from the documents
-- If a field is absent, omit it from the JSON
-- Extract detailed information for all arrays and objects"""
-    
-    parts = [{"text": sys_prompt}]
-    for f in files:
-        b64 = base64.b64encode(f["bytes"]).decode()
-        parts.append({"inline_data": {"mime_type": f["mime_type"], "data": b64}})
-    
-    response = model.generate_content(parts)
-    
-    # Parse JSON from response
-    text = (response.text or "").strip()
-    if text.startswith("```"):
-        text = text.strip("`")
-    
-    start = text.find("{")
-    end = text.rfind("}")
-    if start != -1 and end != -1 and end > start:
-        text = text[start:end+1]
-    
-    data = json.loads(text)
+    # JSON mode makes the reply a bare JSON document; recovery parsing is only a fallback
+    response = model.generate_content(parts, generation_config=_JSON_GENERATION_CONFIG)
+    data = parse_model_json(response.text or "")
     if not data.get("roll_no"):
         data["roll_no"] = reg_no
     
     return data
 
+def daf_cache_key(files: List[Dict[str, Any]], reg_no: str) -> str:
+    """Build a stable cache key from DAF file contents and roll number"""
+    digest = hashlib.sha256()
+    for f in files:
+        digest.update(f["sha256"].encode())
+    digest.update((reg_no or "").encode())
+    return digest.hexdigest()
+
+# Extractions hold candidate PII: each cache layer (in memory and under .cache/) keeps one for at most a day.
+# Expired files are purged when the server process starts and on every Extract click.
+DAF_CACHE_TTL = 24 * 60 * 60  # seconds
+
+def daf_cache_path(cache_key: str) -> str:
+    """Location of the on-disk extraction for a cache key"""
+    return os.path.join(CACHE_DIR, f"{cache_key}.json")
+
+def purge_expired_extractions():
+    """Delete on-disk extractions older than DAF_CACHE_TTL"""
+    cutoff = time.time() - DAF_CACHE_TTL
+    try:
+        with os.scandir(CACHE_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+    except OSError:
+        pass
+
+@st.cache_resource(show_spinner=False)
+def purge_extractions_at_startup() -> bool:
+    """Run the expiry purge once per server process"""
+    purge_expired_extractions()
+    return True
+
+purge_extractions_at_startup()
+
+def forget_extraction(cache_key: str, reg_no: str):
+    """Drop one cached extraction so the next request goes back to Gemini"""
+    # _files is excluded from the cache key, so None addresses the same entry
+    extract_candidate_json_cached.clear(cache_key, None, reg_no)
+    try:
+        os.remove(daf_cache_path(cache_key))
+    except OSError:
+        pass
+
+@st.cache_data(show_spinner=False, ttl=DAF_CACHE_TTL)
+def extract_candidate_json_cached(cache_key: str, _files: List[Dict[str, Any]], reg_no: str) -> Dict[str, Any]:
+    """Memoize extraction by file-content hash (in memory and on disk) so identical uploads skip Gemini"""
+    cache_path = daf_cache_path(cache_key)
+    try:
+        with open(cache_path, "rb") as fh:
+            return orjson.loads(fh.read())
+    except (OSError, ValueError):
+        pass
+    
+    data = extract_candidate_json(_files, reg_no)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(cache_path, "wb") as fh:
+            fh.write(orjson.dumps(data))
+    except OSError:
+        pass
+    return data
+
+_MIME_TYPES = {
+    "pdf": "application/pdf",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png"
+}
+
 def get_mime_type(filename: str) -> str:
     """Get MIME type from filename"""
-    ext = filename.split(".")[-1].lower()
-    mime_types = {
-        "pdf": "application/pdf",
-        "jpg": "image/jpeg",
-        "jpeg": "image/jpeg",
-        "png": "image/png"
+    ext = os.path.splitext(filename)[1][1:].lower()
+    return _MIME_TYPES.get(ext, "application/octet-stream")
+
+def read_daf_file(file) -> Dict[str, Any]:
+    """Fingerprint an uploaded DAF file without copying its contents"""
+    with file.getbuffer() as view:
+        sha256 = hashlib.sha256(view).hexdigest()
+    return {
+        "file": file,
+        "sha256": sha256,
+        "mime_type": get_mime_type(file.name),
+        "filename": file.name
     }
-    return mime_types.get(ext, "application/octet-stream")
+
+def set_current_candidate(roll_no: str):
+    """Switch the active candidate, dropping a feedback request made for the previous one"""
+    if st.session_state.current_candidate != roll_no:
+        st.session_state.feedback_requested = None
+    st.session_state.current_candidate = roll_no
+
+def set_candidate_json(data: Dict[str, Any]):
+    """Store candidate data along with its serialized editor text"""
+    st.session_state.candidate_json = data
+    st.session_state.candidate_json_text = to_pretty_json(data)
 
 # Step 1: Candidate Input
 st.header("Step 1: Candidate Information")
@@ -210,6 +428,7 @@ with col1:
 
 with col2:
     st.write(" ")  # Spacing
+    force_extract = st.checkbox("Re-extract (ignore cached result)")
 
 daf1_file = st.file_uploader("Upload DAF-1 (PDF/Image)", type=["pdf", "png", "jpg", "jpeg"])
 daf2_file = st.file_uploader("Upload DAF-2 (PDF/Image)", type=["pdf", "png", "jpg", "jpeg"])
@@ -218,18 +437,16 @@ if st.button("Extract Candidate Information", type="primary"):
     if not (daf1_file and daf2_file):
         st.error("Please upload both DAF-1 and DAF-2 files.")
     else:
-        files_for_processing = []
-        for file in [daf1_file, daf2_file]:
-            file_bytes = file.read()
-            files_for_processing.append({
-                "bytes": file_bytes,
-                "mime_type": get_mime_type(file.name),
-                "filename": file.name
-            })
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            files_for_processing = list(executor.map(read_daf_file, [daf1_file, daf2_file]))
         
         try:
             with st.spinner("Extracting candidate information..."):
-                st.session_state.candidate_json = extract_candidate_json(files_for_processing, reg_no)
+                purge_expired_extractions()
+                cache_key = daf_cache_key(files_for_processing, reg_no)
+                if force_extract:
+                    forget_extraction(cache_key, reg_no)
+                set_candidate_json(extract_candidate_json_cached(cache_key, files_for_processing, reg_no))
             st.success("✅ Candidate information extracted successfully!")
         except Exception as e:
             st.error(f"❌ Extraction failed: {e}")
@@ -240,15 +457,18 @@ st.markdown("---")
 st.header("Step 2: Review Candidate Information")
 
 if st.session_state.candidate_json:
-    editable_json = st.text_area(
-        "Candidate Information (JSON - Editable)",
-        value=json.dumps(st.session_state.candidate_json, indent=2, ensure_ascii=False),
-        height=300
-    )
+    # A form holds edits client-side, so typing never reruns the script until Update is pressed
+    with st.form("candidate_json_form", border=False):
+        editable_json = st.text_area(
+            "Candidate Information (JSON - Editable)",
+            value=st.session_state.candidate_json_text,
+            height=300
+        )
+        update_clicked = st.form_submit_button("Update Information")
     
-    if st.button("Update Information"):
+    if update_clicked:
         try:
-            st.session_state.candidate_json = json.loads(editable_json)
+            set_candidate_json(orjson.loads(editable_json))
             st.success("✅ Candidate information updated.")
         except Exception as e:
             st.error(f"❌ Invalid JSON format: {e}")
@@ -260,160 +480,84 @@ st.markdown("---")
 # Step 3: Create Assistant
 st.header("Step 3: Create Interview Assistant")
 
-def create_interview_prompt(candidate_data: Dict[str, Any]) -> str:
+def create_interview_prompt(candidate_data: Dict[str, Any], candidate_json_text: str = "") -> str:
     """Create interview prompt based on candidate data"""
-    name = candidate_data.get("name", "Candidate")
-    roll_no = candidate_data.get("roll_no", "")
-    
-    prompt = f"""[Identity]
-You are a UPSC Interview Board Member conducting the Civil Services Personality Test.
-Role: Senior bureaucrat/academician, neutral and impartial.
-Purpose: To simulate a 30-35 minute UPSC Personality Test Interview for candidate {name} (Roll No: {roll_no}), followed by 5 minutes of feedback.
-
-[Style]
-- Formal, dignified, polite, and probing
-- Neutral and impartial
-- Adaptive: switch roles between Chair and Subject-Matter Experts
-- Build follow-up questions from candidate's answers
-
-[Response Guidelines]
-- Ask one clear question at a time (The question must not be too long)
-- If vague → ask for specifics
-- If fact-only → seek opinion/analysis
-- If hesitant → reassure
-- If extreme view → present counterview
-- Always stay courteous
-- Do be either too positive or too negative
-
-[Interview Flow]
-1) Opening (2 min)
-2) DAF-based Background (8-10 min)
-3) Academic & Optional Subject (8-10 min)
-4) Hobbies, ECAs & Personality (5-7 min)
-5) Current Affairs & Governance (7-8 min)
-6) Closing (2 min)
-7) Feedback (5 min)
-
-[Error Handling]
-- If candidate says "I don't know" accept gracefully
-- If candidate misunderstands politely clarify
-
-[Candidate Information]
-{json.dumps(candidate_data, indent=2, ensure_ascii=False)}"""
-    
-    return prompt
+    return render_interview_prompt(
+        candidate_data.get("name", "Candidate"),
+        candidate_data.get("roll_no", ""),
+        candidate_json_text or to_pretty_json(candidate_data)
+    )
 
 def create_vapi_assistant(name: str, system_prompt: str, roll_no: str) -> str:
     """Create Vapi assistant and return assistant ID"""
     url = f"{VAPI_BASE_URL}/assistant"
-    headers = {
-        "Authorization": f"Bearer {VAPI_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
-    # Analysis plan for structured feedback
-    summary_messages = [
-        {
-            "role": "system",
-            "content": "You are an expert note-taker. Summarize the interview call in 2-3 sentences, highlighting key topics/questions asked and candidate's response areas (background, current affairs, ethics, optional subject, hobbies)."
-        },
-        {
-            "role": "user",
-            "content": "Here is the transcript:\n\n{{transcript}}\n\nHere is the ended reason of the call:\n\n{{endedReason}}"
-        }
-    ]
-    
-    structured_schema = {
-        "type": "object",
-        "properties": {
-            "clarityOfExpression": {"type": "string"},
-            "reasoningAbility": {"type": "string"},
-            "analyticalDepth": {"type": "string"},
-            "currentAffairsAwareness": {"type": "string"},
-            "ethicalJudgment": {"type": "string"},
-            "personalityTraits": {"type": "string"},
-            "socialAwareness": {"type": "string"},
-            "hobbiesDepth": {"type": "string"},
-            "overallImpression": {"type": "string"},
-            "strengths": {"type": "string"},
-            "areasForImprovement": {"type": "string"},
-            "overallFeedback": {"type": "string"}
-        }
-    }
-    
-    structured_messages = [
-        {
-            "role": "system",
-            "content": f"Extract structured interview performance data. Each field should contain qualitative comments (2-3 sentences max). Output JSON with all fields populated.\n\nSchema:\n{json.dumps(structured_schema)}"
-        },
-        {
-            "role": "user",
-            "content": "Here is the transcript:\n\n{{transcript}}\n\nHere is the ended reason of the call:\n\n{{endedReason}}"
-        }
-    ]
-    
-    success_messages = [
-        {
-            "role": "system",
-            "content": "Evaluate the interview success based on: 1) Clarity of Expression, 2) Reasoning & Analytical Depth, 3) Current Affairs & Governance Awareness, 4) Ethical & Situational Judgment, 5) Personality Traits & Social Awareness. Provide overall rating: Highly Suitable/Suitable/Borderline/Unsuitable with brief justification."
-        },
-        {
-            "role": "user",
-            "content": "Here is the transcript:\n\n{{transcript}}\n\nHere is the ended reason:\n\n{{endedReason}}\n\nHere was the system prompt:\n\n{{systemPrompt}}"
-        }
-    ]
     
     payload = {
+        **VAPI_ASSISTANT_DEFAULTS,
         "name": name,
-        "voice": {
-            "provider": "11labs",
-            "model": "eleven_multilingual_v2",
-            "voiceId": "1vSsmMcrftVqwsGrxUMM",
-            "speed": 0.95,
-            "stability": 0.5,
-            "similarityBoost": 0.75
-        },
-        "maxDurationSeconds": 2400,
         "model": {
             "provider": "openai",
             "model": "gpt-4o-mini",
             "messages": [{"role": "system", "content": system_prompt}]
         },
-        "firstMessage": "Welcome, please be seated. Shall we begin the interview?",
-        "voicemailMessage": "Please call back when you're available.",
-        "endCallMessage": "Thank you for your time. Goodbye.",
-        "transcriber": {
-            "provider": "deepgram",
-            "model": "nova-2",
-            "language": "en"
-        },
-        "analysisPlan": {
-            "summaryPlan": {"messages": summary_messages},
-            "structuredDataPlan": {
-                "enabled": True,
-                "schema": structured_schema,
-                "messages": structured_messages
-            },
-            "successEvaluationPlan": {
-                "rubric": "DescriptiveScale",
-                "messages": success_messages
-            }
-        },
         "metadata": {
             "roll_no": roll_no,
             "app": "drishti-upsc-mock-interview"
         }
     }
     
-    response = requests.post(url, headers=headers, json=payload)
+    response = get_vapi_session().post(url, data=orjson.dumps(payload), timeout=HTTP_TIMEOUT)
     if response.status_code >= 300:
         raise RuntimeError(f"Assistant creation failed: {response.status_code} {response.text}")
     
-    return response.json().get("id")
+    return orjson.loads(response.content).get("id")
+
+@st.cache_resource
+def get_background_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for slow API calls that should not block reruns"""
+    return ThreadPoolExecutor(max_workers=4)
+
+def submit_background(fn, *args):
+    """Run fn on the worker pool with this session's script context attached"""
+    ctx = get_script_run_ctx()
+    
+    def run():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+    
+    return get_background_executor().submit(run)
+
+@st.fragment(run_every=1 if st.session_state.assistant_job else None)
+def render_assistant_job():
+    """Poll the background assistant creation and publish its result"""
+    job = st.session_state.assistant_job
+    if not job:
+        return
+    if not job["future"].done():
+        st.status(f"Creating interview assistant for {job['name']}...", state="running")
+        return
+    
+    st.session_state.assistant_job = None
+    try:
+        assistant_id = job["future"].result()
+        assistant_info = {
+            "assistant_id": assistant_id,
+            "candidate_json": job["candidate_json"],
+            "name": job["name"],
+            "prompt_hash": job["prompt_hash"]
+        }
+        st.session_state.assistants[job["roll_no"]] = assistant_info
+        save_assistant(job["roll_no"], assistant_info)
+        set_current_candidate(job["roll_no"])
+        st.session_state.assistant_job_result = ("success", f"✅ Interview assistant created successfully! Assistant ID: {assistant_id}")
+    except Exception as e:
+        st.session_state.assistant_job_result = ("error", f"❌ Failed to create assistant: {e}")
+    st.rerun()
 
 if st.session_state.candidate_json:
     candidate_name = st.session_state.candidate_json.get("name", "Candidate")
-    roll_no = st.session_state.candidate_json.get("roll_no", reg_no or "")
+    # Roll numbers are keyed as strings everywhere (the registry stores TEXT), even if the JSON holds a number
+    roll_no = str(st.session_state.candidate_json.get("roll_no") or reg_no or "")
     
     # Show current assistant status
     if roll_no in st.session_state.assistants:
@@ -421,25 +565,38 @@ if st.session_state.candidate_json:
         assistant_info = st.session_state.assistants[roll_no]
         st.info(f"Assistant ID: {assistant_info['assistant_id']}")
     
-    if st.button("Create/Update Interview Assistant", type="primary"):
+    if st.session_state.assistant_job_result:
+        kind, message = st.session_state.assistant_job_result
+        st.session_state.assistant_job_result = None
+        (st.success if kind == "success" else st.error)(message)
+    
+    if st.button("Create/Update Interview Assistant", type="primary", disabled=bool(st.session_state.assistant_job)):
         try:
-            with st.spinner("Creating interview assistant..."):
-                interview_prompt = create_interview_prompt(st.session_state.candidate_json)
+            interview_prompt = create_interview_prompt(st.session_state.candidate_json, st.session_state.candidate_json_text)
+            prompt_hash = hashlib.blake2b(interview_prompt.encode()).hexdigest()
+            existing = st.session_state.assistants.get(roll_no)
+            
+            if existing and existing.get("prompt_hash") == prompt_hash:
+                # Prompt unchanged: reuse the existing assistant instead of creating a duplicate
+                set_current_candidate(roll_no)
+                st.success("✅ Candidate information unchanged. Reusing existing assistant.")
+                st.info(f"Assistant ID: {existing['assistant_id']}")
+            else:
+                # Create on a worker thread so the page stays interactive
                 assistant_name = f"UPSC Board Member - {roll_no}"
-                assistant_id = create_vapi_assistant(assistant_name, interview_prompt, roll_no)
-                
-                st.session_state.assistants[roll_no] = {
-                    "assistant_id": assistant_id,
+                st.session_state.assistant_job = {
+                    "future": submit_background(create_vapi_assistant, assistant_name, interview_prompt, roll_no),
+                    "roll_no": roll_no,
+                    "name": candidate_name,
                     "candidate_json": st.session_state.candidate_json,
-                    "name": candidate_name
+                    "prompt_hash": prompt_hash
                 }
-                st.session_state.current_candidate = roll_no
-                
-            st.success(f"✅ Interview assistant created successfully!")
-            st.info(f"Assistant ID: {assistant_id}")
+                st.rerun()
             
         except Exception as e:
             st.error(f"❌ Failed to create assistant: {e}")
+    
+    render_assistant_job()
 else:
     st.info("Please complete Steps 1-2 to create an interview assistant.")
 
@@ -451,28 +608,28 @@ st.header("Step 4: Deploy & Launch Interview")
 def deploy_to_github_gist(html_content: str, candidate_name: str, roll_no: str) -> tuple:
     """Deploy HTML to GitHub Gist and return viewable URL"""
     try:
-        timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"upsc_interview_{roll_no}_{timestamp}.html"
+        now = dt.datetime.now()
+        filename = f"upsc_interview_{roll_no}_{now:%Y%m%d_%H%M%S}.html"
         
         url = "https://api.github.com/gists"
-        headers = {
-            "Authorization": f"token {GITHUB_TOKEN}",
-            "Accept": "application/vnd.github.v3+json",
-            "Content-Type": "application/json"
-        }
         
         payload = {
-            "description": f"UPSC Mock Interview - {candidate_name} (Roll: {roll_no}) - {dt.datetime.now().strftime('%Y-%m-%d %H:%M')}",
+            "description": f"UPSC Mock Interview - {candidate_name} (Roll: {roll_no}) - {now:%Y-%m-%d %H:%M}",
             "public": False,
             "files": {filename: {"content": html_content}}
         }
         
-        response = requests.post(url, headers=headers, json=payload)
+        body = orjson.dumps(payload)
+        response = get_github_session().post(url, data=body, timeout=HTTP_TIMEOUT)
         
         if response.status_code == 201:
-            result = response.json()
+            result = orjson.loads(response.content)
             raw_url = result["files"][filename]["raw_url"]
-            viewable_url = f"https://htmlpreview.github.io/?{raw_url}"
+            # Optionally serve the commit-pinned raw file from a CDN with an HTML content type
+            if USE_GIST_CDN and raw_url.startswith(GIST_RAW_HOST):
+                viewable_url = GIST_CDN_HOST + raw_url[len(GIST_RAW_HOST):]
+            else:
+                viewable_url = f"https://htmlpreview.github.io/?{raw_url}"
             return viewable_url, None
         else:
             return None, f"GitHub API Error {response.status_code}: {response.text}"
@@ -480,387 +637,338 @@ def deploy_to_github_gist(html_content: str, candidate_name: str, roll_no: str)
     except Exception as e:
         return None, f"Deployment failed: {str(e)}"
 
-def create_interview_html(candidate_name: str, roll_no: str, assistant_id: str) -> str:
-    """Create complete interview HTML with widget integration"""
-    return f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>UPSC Interview - {candidate_name}</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh; color: white; padding: 20px;
-        }}
-        .container {{ max-width: 1000px; margin: 0 auto; }}
-        .header {{ text-align: center; margin-bottom: 30px; }}
-        .header h1 {{ font-size: 2.5em; margin-bottom: 10px; text-shadow: 2px 2px 4px rgba(0,0,0,0.3); }}
-        .main-panel {{
-            background: rgba(255,255,255,0.1); padding: 30px; border-radius: 20px;
-            backdrop-filter: blur(15px); border: 1px solid rgba(255,255,255,0.2);
-            margin-bottom: 20px;
-        }}
-        .status-bar {{
-            background: rgba(0,0,0,0.4); padding: 15px; border-radius: 10px;
-            text-align: center; margin-bottom: 20px; font-weight: 600; font-size: 16px;
-        }}
-        .info-grid {{ 
-            display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); 
-            gap: 20px; margin: 20px 0; 
-        }}
-        .info-card {{
-            background: rgba(255,255,255,0.1); padding: 20px; border-radius: 15px;
-            backdrop-filter: blur(10px); border: 1px solid rgba(255,255,255,0.2);
-        }}
-        .info-card h3 {{ color: #fbbf24; margin-bottom: 10px; }}
-        .widget-container {{
-            background: rgba(255,255,255,0.05); padding: 30px; border-radius: 20px;
-            backdrop-filter: blur(10px); border: 1px solid rgba(255,255,255,0.1);
-            margin: 30px 0; min-height: 400px; position: relative;
-        }}
-        .instructions {{
-            background: rgba(34, 197, 94, 0.2); border: 2px solid #22c55e;
-            padding: 20px; border-radius: 15px; margin: 20px 0;
-        }}
-        .status-indicator {{
-            position: absolute; top: 15px; right: 15px; padding: 8px 15px;
-            border-radius: 20px; font-size: 14px; font-weight: 600;
-            background: rgba(59, 130, 246, 0.3); color: #3b82f6;
-        }}
-        @keyframes pulse {{ 0%, 100% {{ opacity: 1; }} 50% {{ opacity: 0.7; }} }}
-        .live {{ animation: pulse 1.5s infinite; background: rgba(239, 68, 68, 0.3); color: #ef4444; }}
-        @media (max-width: 768px) {{
-            .container {{ padding: 15px; }}
-            .info-grid {{ grid-template-columns: 1fr; }}
-            .header h1 {{ font-size: 2em; }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🎤 UPSC Civil Services Interview</h1>
-            <p style="font-size: 1.2em; opacity: 0.9;">Secure HTTPS Interview Platform</p>
-        </div>
+@st.fragment
+def render_deploy_panel():
+    """Render Step 4 so its buttons rerun only this panel"""
+    if st.session_state.assistants and st.session_state.current_candidate:
+        current_info = st.session_state.assistants[st.session_state.current_candidate]
+        candidate_name = current_info["name"]
+        assistant_id = current_info["assistant_id"]
+        roll_no = st.session_state.current_candidate
         
-        <div class="status-bar" id="statusBar">
-            🔄 Initializing secure interview system...
-        </div>
+        st.success(f"✅ Ready to deploy interview for {candidate_name} (Roll: {roll_no})")
         
-        <div class="main-panel">
-            <div class="info-grid">
-                <div class="info-card">
-                    <h3>📋 Interview Details</h3>
-                    <p><strong>Candidate:</strong> {candidate_name}</p>
-                    <p><strong>Roll Number:</strong> {roll_no}</p>
-                    <p><strong>Interview Type:</strong> Personality Test</p>
-                    <p><strong>Duration:</strong> 30-35 minutes + feedback</p>
-                </div>
-                
-                <div class="info-card">
-                    <h3>🎯 System Status</h3>
-                    <p><strong>Security:</strong> <span style="color: #22c55e;">HTTPS Enabled ✓</span></p>
-                    <p><strong>Microphone:</strong> <span id="micStatus">Checking...</span></p>
-                    <p><strong>Widget:</strong> <span id="widgetStatus">Loading...</span></p>
-                    <p><strong>Ready:</strong> <span id="readyStatus">Preparing...</span></p>
-                </div>
-            </div>
-            
-            <div class="instructions">
-                <h3>📋 Interview Instructions:</h3>
-                <ul style="margin-left: 20px; margin-top: 10px;">
-                    <li><strong>Microphone:</strong> Allow access when prompted by your browser</li>
-                    <li><strong>Environment:</strong> Quiet room with stable internet connection</li>
-                    <li><strong>Speaking:</strong> Clear, confident delivery at normal pace</li>
-                    <li><strong>Listening:</strong> Pay careful attention to each question</li>
-                    <li><strong>Approach:</strong> Be authentic, think before answering, stay calm</li>
-                </ul>
-            </div>
-            
-            <div class="widget-container">
-                <div class="status-indicator" id="statusIndicator">🔄 Loading</div>
-                
-                <vapi-widget
-                    id="vapiWidget"
-                    public-key="{VAPI_PUBLIC_KEY}"
-                    assistant-id="{assistant_id}"
-                    mode="voice"
-                    theme="dark"
-                    base-bg-color="rgba(0,0,0,0.2)"
-                    accent-color="#14B8A6"
-                    cta-button-color="#667eea"
-                    cta-button-text-color="#ffffff"
-                    border-radius="large"
-                    size="full"
-                    position="center"
-                    title="UPSC MOCK INTERVIEW"
-                    start-button-text="🎙️ Begin Interview"
-                    end-button-text="📞 End Interview"
-                    voice-show-transcript="true"
-                    consent-required="true"
-                    consent-title="Interview Consent"
-                    consent-content="By proceeding, I consent to the recording and analysis of this mock interview session for assessment purposes."
-                    consent-storage-key="upsc_interview_consent"
-                ></vapi-widget>
-            </div>
-        </div>
-    </div>
-
-    <script src="https://unpkg.com/@vapi-ai/client-sdk-react/dist/embed/widget.umd.js" async></script>
-    
-    <script>
-        let widgetReady = false;
-        let interviewActive = false;
+        col1, col2 = st.columns(2)
         
-        function updateStatus(message, type = 'info') {{
-            const statusBar = document.getElementById('statusBar');
-            const indicator = document.getElementById('statusIndicator');
-            const statusEmojis = {{ 'info': '🔄', 'success': '✅', 'warning': '⚠️', 'error': '❌', 'live': '🔴' }};
-            
-            statusBar.innerHTML = `${{statusEmojis[type] || '🔄'}} ${{message}}`;
-            
-            if (type === 'live') {{
-                indicator.textContent = '🔴 LIVE';
-                indicator.classList.add('live');
-            }} else {{
-                indicator.textContent = type === 'success' ? '✅ Ready' : type === 'error' ? '❌ Error' : '🔄 Loading';
-                indicator.classList.remove('live');
-            }}
-        }}
-        
-        function updateSystemStatus(component, status, isGood = true) {{
-            const element = document.getElementById(component + 'Status');
-            if (element) {{
-                element.textContent = status;
-                element.style.color = isGood ? '#22c55e' : '#ef4444';
-                element.style.fontWeight = '600';
-            }}
-        }}
-        
-        async function checkMicrophone() {{
-            try {{
-                updateSystemStatus('mic', 'Testing...', true);
-                const stream = await navigator.mediaDevices.getUserMedia({{ audio: true }});
-                const tracks = stream.getTracks();
+        with col1:
+            if st.button("🚀 Deploy & Launch Interview", type="primary", use_container_width=True):
+                started_at = dt.datetime.now()
+                st.session_state.interview_started_at = started_at.astimezone(dt.timezone.utc).isoformat()
+                st.session_state.interview_status = "starting"
                 
-                if (tracks.length > 0) {{
-                    updateSystemStatus('mic', 'Access granted ✓', true);
-                    tracks.forEach(track => track.stop());
-                    return true;
-                }}
-            }} catch (error) {{
-                updateSystemStatus('mic', 'Access needed ✗', false);
-                updateStatus('⚠️ Please allow microphone access when prompted', 'warning');
-                return false;
-            }}
-        }}
-        
-        function setupWidget() {{
-            const widget = document.getElementById('vapiWidget');
-            if (!widget) return;
-            
-            widget.addEventListener('call-start', () => {{
-                interviewActive = true;
-                updateStatus('🔴 Interview in progress - Good luck!', 'live');
-                updateSystemStatus('ready', 'Live Interview ✓', true);
-                document.title = '🔴 LIVE: UPSC Interview - {candidate_name}';
-            }});
-            
-            widget.addEventListener('call-end', () => {{
-                interviewActive = false;
-                updateStatus('✅ Interview completed successfully', 'success');
-                updateSystemStatus('ready', 'Completed ✓', true);
-                document.title = '✅ Completed: UPSC Interview - {candidate_name}';
-            }});
-            
-            widget.addEventListener('error', () => {{
-                interviewActive = false;
-                updateStatus('❌ Technical error - Please refresh and try again', 'error');
-                updateSystemStatus('ready', 'Error ✗', false);
-            }});
-            
-            widget.addEventListener('ready', () => {{
-                widgetReady = true;
-                updateSystemStatus('widget', 'Loaded ✓', true);
-                updateSystemStatus('ready', 'Ready to start ✓', true);
-                updateStatus('✅ Interview system ready - Click "Begin Interview"', 'success');
-            }});
-        }}
+                with st.spinner("Deploying to secure HTTPS hosting..."):
+                    html_content = create_interview_html(candidate_name, roll_no, assistant_id, VAPI_PUBLIC_KEY)
+                    deployed_url, error = deploy_to_github_gist(html_content, candidate_name, roll_no)
+                    
+                    if deployed_url:
+                        st.session_state.deployed_interview = {
+                            'url': deployed_url,
+                            'candidate': candidate_name,
+                            'roll_no': roll_no,
+                            'timestamp': started_at
+                        }
+                        
+                        if st.session_state.browser_opened_for != deployed_url:
+                            import webbrowser
+                            threading.Thread(target=webbrowser.open, args=(deployed_url,), daemon=True).start()
+                            st.session_state.browser_opened_for = deployed_url
+                        st.success("🚀 Interview deployed successfully!")
+                        st.session_state.interview_status = "active"
+                    else:
+                        st.error(f"❌ Deployment failed: {error}")
+                        st.session_state.interview_status = "error"
         
-        async function initializeSystem() {{
-            updateStatus('🔄 Initializing secure interview system...', 'info');
-            
-            await checkMicrophone();
-            
-            setTimeout(() => {{
-                setupWidget();
-                updateSystemStatus('widget', 'Initializing...', true);
+        with col2:
+            if st.button("💾 Download HTML Backup", use_container_width=True):
+                html_bytes = create_interview_html(candidate_name, roll_no, assistant_id, VAPI_PUBLIC_KEY).encode("utf-8")
                 
-                setTimeout(() => {{
-                    if (!widgetReady) {{
-                        updateStatus('⚠️ Widget loading slowly - please wait', 'warning');
-                    }}
-                }}, 5000);
-            }}, 1000);
-        }}
-        
-        window.addEventListener('beforeunload', (event) => {{
-            if (interviewActive) {{
-                event.preventDefault();
-                event.returnValue = 'Your interview is in progress. Are you sure you want to leave?';
-            }}
-        }});
+                st.download_button(
+                    label="📁 Download Interview File",
+                    data=html_bytes,
+                    file_name=f"upsc_interview_{roll_no}_{st.session_state.download_timestamp}.html",
+                    mime="text/html",
+                    use_container_width=True
+                )
         
-        document.addEventListener('DOMContentLoaded', initializeSystem);
-    </script>
-</body>
-</html>"""
-
-if st.session_state.assistants and st.session_state.current_candidate:
-    current_info = st.session_state.assistants[st.session_state.current_candidate]
-    candidate_name = current_info["name"]
-    assistant_id = current_info["assistant_id"]
-    roll_no = st.session_state.current_candidate
-    
-    st.success(f"✅ Ready to deploy interview for {candidate_name} (Roll: {roll_no})")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if st.button("🚀 Deploy & Launch Interview", type="primary", use_container_width=True):
-            st.session_state.interview_started_at = dt.datetime.now().isoformat()
-            st.session_state.interview_status = "starting"
+        # Show deployment status
+        if st.session_state.deployed_interview:
+            deploy_info = st.session_state.deployed_interview
             
-            with st.spinner("Deploying to secure HTTPS hosting..."):
-                html_content = create_interview_html(candidate_name, roll_no, assistant_id)
-                deployed_url, error = deploy_to_github_gist(html_content, candidate_name, roll_no)
-                
-                if deployed_url:
-                    st.session_state.deployed_interview = {
-                        'url': deployed_url,
-                        'candidate': candidate_name,
-                        'roll_no': roll_no,
-                        'timestamp': dt.datetime.now()
-                    }
-                    
-                    webbrowser.open(deployed_url)
-                    st.success("🚀 Interview deployed successfully!")
-                    st.session_state.interview_status = "active"
-                else:
-                    st.error(f"❌ Deployment failed: {error}")
-                    st.session_state.interview_status = "error"
-    
-    with col2:
-        if st.button("💾 Download HTML Backup", use_container_width=True):
-            html_content = create_interview_html(candidate_name, roll_no, assistant_id)
-            timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M")
+            st.markdown("---")
+            st.subheader("📡 Active Deployment")
             
-            st.download_button(
-                label="📁 Download Interview File",
-                data=html_content,
-                file_name=f"upsc_interview_{roll_no}_{timestamp}.html",
-                mime="text/html",
-                use_container_width=True
-            )
-    
-    # Show deployment status
-    if st.session_state.deployed_interview:
-        deploy_info = st.session_state.deployed_interview
-        
-        st.markdown("---")
-        st.subheader("📡 Active Deployment")
-        
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Status", "🟢 Live & Secure")
-        with col2:
-            elapsed = dt.datetime.now() - deploy_info['timestamp']
-            st.metric("Uptime", f"{elapsed.seconds // 60}m {elapsed.seconds % 60}s")
-        with col3:
-            st.metric("Security", "HTTPS ✓")
-        
-        st.code(deploy_info['url'], language=None)
-        
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.link_button("🔗 Open Interview", deploy_info['url'], use_container_width=True)
-        with col2:
-            if st.button("📋 Copy URL", use_container_width=True):
-                copy_script = f"""
+            st.code(deploy_info['url'], language=None)
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Status", "🟢 Live & Secure")
+                st.link_button("🔗 Open Interview", deploy_info['url'], use_container_width=True)
+            with col2:
+                elapsed = dt.datetime.now() - deploy_info['timestamp']
+                st.metric("Uptime", f"{elapsed.seconds // 60}m {elapsed.seconds % 60}s")
+                # Copy runs entirely in the browser, so clicking it costs no rerun
+                copy_button = f"""
+                <button id="copyUrl" style="width: 100%; padding: 8px 12px; border-radius: 8px; border: 1px solid rgba(49, 51, 63, 0.2); background: white; cursor: pointer; font-size: 15px;">📋 Copy URL</button>
                 <script>
-                navigator.clipboard.writeText('{deploy_info['url']}').then(() => {{
-                    alert('✅ Interview URL copied!');
-                }});
+                document.getElementById('copyUrl').onclick = () => {{
+                    navigator.clipboard.writeText({json.dumps(deploy_info['url'])}).then(() => {{
+                        alert('✅ Interview URL copied!');
+                    }});
+                }};
                 </script>
                 """
-                st.components.v1.html(copy_script, height=0)
-        with col3:
-            if st.button("🗑️ Clear", use_container_width=True):
-                st.session_state.deployed_interview = None
-                st.rerun()
+                st.components.v1.html(copy_button, height=45)
+            with col3:
+                st.metric("Security", "HTTPS ✓")
+                if st.button("🗑️ Clear", use_container_width=True):
+                    st.session_state.deployed_interview = None
+                    st.session_state.feedback_requested = None
+                    st.rerun()
 
-else:
-    st.info("Please complete Steps 1-3 to deploy an interview.")
+    else:
+        st.info("Please complete Steps 1-3 to deploy an interview.")
+
+render_deploy_panel()
 
 st.markdown("---")
 
 # Step 5: Feedback Analysis
 st.header("Step 5: Interview Feedback & Analysis")
 
-def list_calls(assistant_id: str = None) -> List[Dict[str, Any]]:
-    """List calls for the assistant"""
-    url = f"{VAPI_BASE_URL}/call"
-    headers = {"Authorization": f"Bearer {VAPI_API_KEY}"}
-    params = {"assistantId": assistant_id, "limit": 50} if assistant_id else {"limit": 50}
+# Report formatting
+_SEP50 = "-" * 50
+_SEP60 = "-" * 60
+_TRANSCRIPT_INLINE_LIMIT = 50_000  # characters
+_TRANSCRIPT_PREVIEW_CHARS = 2_000
+_TRANSCRIPT_FOOTER = "Generated by Drishti UPSC Mock Interview Platform\n"
+_REPORT_FOOTER = "Platform: Drishti UPSC Mock Interview System\n© Drishti AI Team\n"
+
+# Feedback criteria and rating bands
+_CRITERIA_MAPPING = {
+    "clarityOfExpression": "Clarity of Expression",
+    "reasoningAbility": "Reasoning Ability",
+    "analyticalDepth": "Analytical Depth",
+    "currentAffairsAwareness": "Current Affairs Awareness",
+    "ethicalJudgment": "Ethical Judgment",
+    "personalityTraits": "Personality Traits",
+    "socialAwareness": "Social Awareness",
+    "hobbiesDepth": "Hobbies & Interests",
+    "overallImpression": "Overall Impression",
+    "strengths": "Key Strengths",
+    "areasForImprovement": "Areas for Improvement",
+    "overallFeedback": "Overall Feedback"
+}
+
+_FEEDBACK_COLUMNS = {
+    "Assessment Criteria": st.column_config.TextColumn(width="medium"),
+    "Detailed Feedback": st.column_config.TextColumn(width="large")
+}
+
+_SUITABLE_RATINGS = frozenset({"Highly Suitable", "Suitable"})
+_BORDERLINE_RATINGS = frozenset({"Borderline"})
+_UNSUITABLE_RATINGS = frozenset({"Unsuitable"})
+
+def get_candidate_header() -> str:
+    """Return the candidate name/roll header for the current candidate"""
+    roll_no = st.session_state.current_candidate
+    name = st.session_state.assistants[roll_no]["name"]
+    return f"Candidate: {name}\nRoll Number: {roll_no}"
+
+def build_transcript_content(transcript: str, now: dt.datetime) -> str:
+    """Build the downloadable transcript text"""
+    return f"""UPSC Mock Interview Transcript
+{get_candidate_header()}
+Date: {now:%Y-%m-%d %H:%M:%S}
+
+{_SEP50}
+
+{transcript}
+
+{_SEP50}
+{_TRANSCRIPT_FOOTER}"""
+
+def build_report_content(summary: str, rating: str, justification: str, feedback_rows: List[Dict[str, str]], now: dt.datetime) -> str:
+    """Build the downloadable performance report text"""
+    buf = io.StringIO()
+    buf.write(f"""UPSC Mock Interview - Performance Report
+{get_candidate_header()}
+Interview Date: {now:%Y-%m-%d}
+
+{_SEP60}
+EXECUTIVE SUMMARY
+{_SEP60}
+{summary}
+
+{_SEP60}
+OVERALL ASSESSMENT: {rating or 'Not Available'}
+{_SEP60}
+{justification or 'Assessment completed.'}
+
+{_SEP60}
+DETAILED PERFORMANCE ANALYSIS
+{_SEP60}
+""")
+    for row in feedback_rows:
+        buf.write(f"\n{row['Assessment Criteria']}:\n{row['Detailed Feedback']}\n")
+    
+    buf.write(f"""
+{_SEP60}
+Report Generated: {now:%Y-%m-%d %H:%M:%S}
+{_REPORT_FOOTER}""")
+    return buf.getvalue()
+
+def prepared_download(kind: str, call_id: str, label: str, build, *inputs) -> bytes:
+    """Build download bytes only after the user asks for them, once per call and content"""
+    # Key on the content inputs too, so a file prepared mid-call is rebuilt once the analysis lands
+    key = (call_id, hashlib.blake2b(orjson.dumps(inputs)).hexdigest())
+    prepared = st.session_state.prepared_downloads.get(kind)
+    if prepared and prepared[0] == key:
+        return prepared[1]
+    if st.button(label, use_container_width=True, key=f"prepare_{kind}"):
+        data = build().encode()
+        st.session_state.prepared_downloads[kind] = (key, data)
+        return data
+    return b""
+
+class LRUStore:
+    """Thread-safe mapping that evicts its least recently used entries beyond maxsize"""
+    
+    def __init__(self, maxsize: int):
+        self._data = OrderedDict()
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+@st.cache_resource
+def get_vapi_validators() -> LRUStore:
+    """Shared (ETag, body) store for conditional VAPI GETs"""
+    return LRUStore(maxsize=256)
+
+class VapiUnavailableError(RuntimeError):
+    """VAPI is failing transiently; polling is paused rather than treated as an interview error"""
+
+VAPI_BREAKER_THRESHOLD = 3
+VAPI_BREAKER_COOLDOWN = 30  # seconds
+
+@st.cache_resource
+def get_vapi_breaker() -> Tuple[Dict[str, float], threading.Lock]:
+    """Shared circuit-breaker state for VAPI reads, with the lock guarding it across sessions"""
+    return {"failures": 0, "open_until": 0.0}, threading.Lock()
+
+def record_vapi_failure(action: str, reason: str) -> VapiUnavailableError:
+    """Count a transient failure, opening the breaker after repeated ones"""
+    breaker, lock = get_vapi_breaker()
+    with lock:
+        breaker["failures"] += 1
+        if breaker["failures"] >= VAPI_BREAKER_THRESHOLD:
+            breaker["open_until"] = time.monotonic() + VAPI_BREAKER_COOLDOWN
+    return VapiUnavailableError(f"{action} failed: {reason}")
+
+def get_vapi_json(url: str, action: str, params: Dict[str, Any] = None) -> Any:
+    """GET a VAPI resource, reusing the last body when the server answers 304"""
+    breaker, lock = get_vapi_breaker()
+    with lock:
+        paused = time.monotonic() < breaker["open_until"]
+    if paused:
+        raise VapiUnavailableError(f"{action} paused after repeated VAPI failures")
     
-    response = requests.get(url, headers=headers, params=params)
+    validators = get_vapi_validators()
+    key = (url, tuple(sorted((params or {}).items())))
+    cached = validators.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else None
+    
+    try:
+        response = get_vapi_session().get(url, params=params, headers=headers, timeout=POLL_TIMEOUT)
+    except requests.RequestException as e:
+        raise record_vapi_failure(action, str(e)) from e
+    if response.status_code == 429 or response.status_code >= 500:
+        raise record_vapi_failure(action, str(response.status_code))
+    with lock:
+        breaker["failures"] = 0
+    if response.status_code == 304 and cached:
+        return cached[1]
     if response.status_code >= 300:
-        raise RuntimeError(f"List calls failed: {response.status_code}")
+        raise RuntimeError(f"{action} failed: {response.status_code}")
+    
+    data = orjson.loads(response.content)
+    etag = response.headers.get("ETag")
+    if etag:
+        validators[key] = (etag, data)
+    return data
+
+@st.cache_data(ttl=8, max_entries=128, show_spinner=False)
+def list_calls(assistant_id: str = None, created_after: str = None, limit: int = 1) -> List[Dict[str, Any]]:
+    """List the assistant's most recent calls (newest first), optionally only those created after a UTC timestamp"""
+    url = f"{VAPI_BASE_URL}/call"
+    params = {"limit": limit}
+    if assistant_id:
+        params["assistantId"] = assistant_id
+    if created_after:
+        params["createdAtGt"] = created_after
     
-    data = response.json()
+    data = get_vapi_json(url, "List calls", params)
     return data.get("items", []) if isinstance(data, dict) else data
 
+def is_call_final(call: Dict[str, Any]) -> bool:
+    """True once a call has ended and its structured analysis and evaluation are both in"""
+    analysis = call.get("analysis") or {}
+    return call.get("status") == "ended" and bool(analysis.get("structuredData")) and bool(analysis.get("successEvaluation"))
+
+@st.cache_resource
+def get_ended_calls() -> LRUStore:
+    """Shared store of ended, fully analysed calls, which never change again"""
+    return LRUStore(maxsize=128)
+
+@st.cache_data(ttl=8, max_entries=128, show_spinner=False)
 def get_call_details(call_id: str) -> Dict[str, Any]:
     """Get detailed call information"""
-    url = f"{VAPI_BASE_URL}/call/{call_id}"
-    headers = {"Authorization": f"Bearer {VAPI_API_KEY}"}
+    ended_calls = get_ended_calls()
+    call = ended_calls.get(call_id)
+    if call is not None:
+        return call
     
-    response = requests.get(url, headers=headers)
-    if response.status_code >= 300:
-        raise RuntimeError(f"Get call failed: {response.status_code}")
-    
-    return response.json()
+    call = get_vapi_json(f"{VAPI_BASE_URL}/call/{call_id}", "Get call")
+    if is_call_final(call):
+        ended_calls[call_id] = call
+    return call
 
-def format_feedback_table(call_data: Dict[str, Any]) -> pd.DataFrame:
-    """Format feedback data for display"""
-    analysis = call_data.get("analysis", {})
-    structured = analysis.get("structuredData", {})
-    
-    criteria_mapping = {
-        "clarityOfExpression": "Clarity of Expression",
-        "reasoningAbility": "Reasoning Ability",
-        "analyticalDepth": "Analytical Depth",
-        "currentAffairsAwareness": "Current Affairs Awareness",
-        "ethicalJudgment": "Ethical Judgment",
-        "personalityTraits": "Personality Traits",
-        "socialAwareness": "Social Awareness",
-        "hobbiesDepth": "Hobbies & Interests",
-        "overallImpression": "Overall Impression",
-        "strengths": "Key Strengths",
-        "areasForImprovement": "Areas for Improvement",
-        "overallFeedback": "Overall Feedback"
-    }
+def resolve_call_details(call: Dict[str, Any]) -> Dict[str, Any]:
+    """Use a listed call as-is once it is ended and complete, otherwise fetch its details"""
+    if is_call_final(call) and call.get("artifact"):
+        return call
+    return get_call_details(call["id"])
+
+def get_success_evaluation(call_data: Dict[str, Any]) -> Tuple[str, str]:
+    """Return (rating, justification), accepting both dict and plain-text successEvaluation"""
+    success_eval = (call_data.get("analysis") or {}).get("successEvaluation") or {}
+    if isinstance(success_eval, dict):
+        return success_eval.get("overallRating", ""), success_eval.get("justification", success_eval.get("reason", ""))
+    # The DescriptiveScale rubric returns a single descriptive string
+    return str(success_eval), ""
+
+def format_feedback_table(call_data: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Format feedback data for display as a list of row records"""
+    analysis = call_data.get("analysis") or {}
+    structured = analysis.get("structuredData") or {}
     
-    rows = []
-    for key, display_name in criteria_mapping.items():
-        if key in structured and structured[key]:
-            rows.append({
-                "Assessment Criteria": display_name,
-                "Detailed Feedback": structured[key]
-            })
+    rows = [
+        {"Assessment Criteria": display_name, "Detailed Feedback": structured[key]}
+        for key, display_name in _CRITERIA_MAPPING.items()
+        if structured.get(key)
+    ]
     
     if not rows:
         rows.append({
@@ -868,167 +976,187 @@ def format_feedback_table(call_data: Dict[str, Any]) -> pd.DataFrame:
             "Detailed Feedback": "Analysis in progress. Please wait for interview completion."
         })
     
-    return pd.DataFrame(rows)
+    return rows
 
 auto_refresh = st.checkbox("Auto-refresh every 10 seconds")
-fetch_feedback = st.button("Fetch Latest Feedback", type="primary")
 
-if auto_refresh:
-    time.sleep(10)
-    st.rerun()
+@st.fragment(run_every=10 if auto_refresh else None)
+def render_feedback_panel():
+    """Render Step 5 so auto-refresh reruns only this panel"""
+    fetch_feedback = st.button("Fetch Latest Feedback", type="primary")
+    current = st.session_state.current_candidate
+    assistant_id = st.session_state.assistants[current]["assistant_id"] if current else None
 
-if (fetch_feedback or auto_refresh) and st.session_state.current_candidate:
-    assistant_id = st.session_state.assistants[st.session_state.current_candidate]["assistant_id"]
-    started_after = st.session_state.interview_started_at or "1970-01-01T00:00:00Z"
-    
-    try:
-        calls = list_calls(assistant_id)
-        
-        # Filter calls after interview start time
-        relevant_calls = []
-        for call in calls:
-            if call.get("assistantId") == assistant_id:
-                call_start = call.get("startedAt", "")
-                if call_start >= started_after:
-                    relevant_calls.append(call)
+    if fetch_feedback and assistant_id:
+        # Explicit fetch always bypasses the short-lived VAPI response cache
+        list_calls.clear()
+        get_call_details.clear()
+        # Keep this assistant's report on screen across reruns triggered by its download buttons
+        st.session_state.feedback_requested = assistant_id
+
+    polling = fetch_feedback or auto_refresh
+    redisplay = assistant_id is not None and st.session_state.feedback_requested == assistant_id
+    if (polling or redisplay) and assistant_id:
+        now = dt.datetime.now()
+        file_date = now.strftime("%Y%m%d")
         
-        if not relevant_calls:
-            st.info("⏳ Waiting for interview completion. Feedback will appear automatically.")
-        else:
-            # Get the most recent call
-            latest_call = sorted(relevant_calls, key=lambda x: x.get("endedAt", x.get("updatedAt", "")), reverse=True)[0]
-            call_details = get_call_details(latest_call["id"])
-            
-            analysis = call_details.get("analysis", {})
-            summary = analysis.get("summary", "")
-            success_eval = analysis.get("successEvaluation", {})
-            
-            st.subheader("📊 Interview Performance Report")
-            st.success("✅ Interview completed and analyzed!")
-            
-            if summary:
-                st.markdown("### 📝 Executive Summary")
-                st.info(summary)
-                st.markdown("---")
-            
-            # Detailed feedback
-            st.markdown("### 📋 Detailed Assessment")
-            feedback_df = format_feedback_table(call_details)
-            st.dataframe(feedback_df, use_container_width=True, hide_index=True)
+        try:
+            cached = st.session_state.last_call_details
+            if cached and cached.get("assistantId") != assistant_id:
+                cached = None
+            if not polling:
+                # Plain reruns (download buttons, other widgets) redisplay the last result without polling VAPI
+                call_details = cached
+            elif (
+                not fetch_feedback
+                and st.session_state.interview_status == "completed"
+                and cached
+                and is_call_final(cached)
+            ):
+                # Analysis is final: render the stored call without polling VAPI
+                call_details = cached
+            else:
+                # VAPI filters by assistant and start time and returns only the newest call
+                latest_calls = list_calls(assistant_id, st.session_state.interview_started_at)
+                call_details = resolve_call_details(latest_calls[0]) if latest_calls else None
             
-            # Overall rating
-            if success_eval:
-                rating = success_eval.get("overallRating", "")
-                justification = success_eval.get("justification", success_eval.get("reason", ""))
+            if not call_details:
+                st.info("⏳ Waiting for interview completion. Feedback will appear automatically.")
+            else:
+                analysis = call_details.get("analysis") or {}
+                summary = analysis.get("summary", "")
+                
+                st.subheader("📊 Interview Performance Report")
+                st.success("✅ Interview completed and analyzed!")
                 
+                if summary:
+                    st.markdown("### 📝 Executive Summary")
+                    st.info(summary)
+                    st.markdown("---")
+                
+                # Detailed feedback
+                st.markdown("### 📋 Detailed Assessment")
+                feedback_rows = format_feedback_table(call_details)
+                st.dataframe(feedback_rows, use_container_width=True, hide_index=True, column_config=_FEEDBACK_COLUMNS)
+                
+                # Overall rating
+                rating, justification = get_success_evaluation(call_details)
                 if rating:
                     st.markdown("### 🎯 Final Assessment")
-                    if rating in ["Highly Suitable", "Suitable"]:
+                    if rating in _SUITABLE_RATINGS:
                         st.success(f"🌟 **Overall Assessment: {rating}**")
-                    elif rating in ["Borderline"]:
+                    elif rating in _BORDERLINE_RATINGS:
                         st.warning(f"⚖️ **Overall Assessment: {rating}**")
-                    elif rating in ["Unsuitable"]:
+                    elif rating in _UNSUITABLE_RATINGS:
                         st.error(f"📉 **Overall Assessment: {rating}**")
                     else:
                         st.info(f"📊 **Overall Assessment: {rating}**")
                     
                     if justification:
                         st.markdown(f"**💡 Justification:** {justification}")
-            
-            # Download options
-            st.markdown("---")
-            st.markdown("### 📁 Download Resources")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                artifact = call_details.get("artifact", {})
-                recording = artifact.get("recording", {}).get("mono", {})
-                if recording.get("combinedUrl"):
-                    st.link_button("🎵 Audio Recording", recording["combinedUrl"], use_container_width=True)
-            
-            with col2:
-                if artifact.get("transcript"):
-                    transcript_content = f"""UPSC Mock Interview Transcript
-Candidate: {st.session_state.assistants[st.session_state.current_candidate]['name']}
-Roll Number: {st.session_state.current_candidate}
-Date: {dt.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-{'-'*50}
-
-{artifact['transcript']}
-
-{'-'*50}
-Generated by Drishti UPSC Mock Interview Platform
-"""
-                    st.download_button(
-                        label="📄 Transcript",
-                        data=transcript_content,
-                        file_name=f"transcript_{st.session_state.current_candidate}_{dt.datetime.now().strftime('%Y%m%d')}.txt",
-                        mime="text/plain",
-                        use_container_width=True
+                
+                # Download options
+                st.markdown("---")
+                st.markdown("### 📁 Download Resources")
+                
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    artifact = call_details.get("artifact") or {}
+                    recording = (artifact.get("recording") or {}).get("mono") or {}
+                    if recording.get("combinedUrl"):
+                        st.link_button("🎵 Audio Recording", recording["combinedUrl"], use_container_width=True)
+                
+                with col2:
+                    if artifact.get("transcript"):
+                        transcript_data = prepared_download(
+                            "transcript", call_details["id"], "📄 Prepare Transcript",
+                            lambda: build_transcript_content(artifact["transcript"], now),
+                            call_details.get("status"), artifact["transcript"]
+                        )
+                        if transcript_data:
+                            st.download_button(
+                                label="📄 Transcript",
+                                data=transcript_data,
+                                file_name=f"transcript_{st.session_state.current_candidate}_{file_date}.txt",
+                                mime="text/plain",
+                                use_container_width=True
+                            )
+                
+                with col3:
+                    # Generate comprehensive report
+                    report_data = prepared_download(
+                        "report", call_details["id"], "📊 Prepare Full Report",
+                        lambda: build_report_content(summary, rating, justification, feedback_rows, now),
+                        call_details.get("status"), summary, rating, justification, feedback_rows
                     )
-            
-            with col3:
-                # Generate comprehensive report
-                report_content = f"""UPSC Mock Interview - Performance Report
-Candidate: {st.session_state.assistants[st.session_state.current_candidate]['name']}
-Roll Number: {st.session_state.current_candidate}
-Interview Date: {dt.datetime.now().strftime('%Y-%m-%d')}
+                    if report_data:
+                        st.download_button(
+                            label="📊 Full Report",
+                            data=report_data,
+                            file_name=f"interview_report_{st.session_state.current_candidate}_{file_date}.txt",
+                            mime="text/plain",
+                            use_container_width=True
+                        )
+                
+                # Transcript viewer
+                # Only send the transcript to the browser while it is being viewed
+                if artifact.get("transcript") and st.toggle("📄 View Complete Transcript", key="show_transcript"):
+                    transcript = artifact["transcript"]
+                    if len(transcript) > _TRANSCRIPT_INLINE_LIMIT:
+                        # Very long transcripts are previewed; the full text is in the transcript download
+                        st.caption("Showing the beginning of a long transcript. Use 📄 Prepare Transcript above to download the full text.")
+                        transcript = transcript[:_TRANSCRIPT_PREVIEW_CHARS]
+                    st.text_area("Interview Transcript", transcript, height=400)
+                
+                # Update session status; keep polling until the analysis is final
+                st.session_state.last_call_details = call_details
+                if is_call_final(call_details):
+                    st.session_state.interview_status = "completed"
+                
+        except VapiUnavailableError as e:
+            st.warning(f"⏸️ VAPI temporarily unavailable, will retry shortly: {e}")
+        except Exception as e:
+            st.error(f"❌ Error fetching feedback: {e}")
+            st.session_state.interview_status = "error"
 
-{'-'*60}
-EXECUTIVE SUMMARY
-{'-'*60}
-{summary}
+    elif not st.session_state.current_candidate:
+        st.info("Please complete previous steps to view feedback.")
 
-{'-'*60}
-OVERALL ASSESSMENT: {rating if 'rating' in locals() else 'Not Available'}
-{'-'*60}
-{justification if 'justification' in locals() else 'Assessment completed.'}
+render_feedback_panel()
 
-{'-'*60}
-DETAILED PERFORMANCE ANALYSIS
-{'-'*60}
-"""
-                for _, row in feedback_df.iterrows():
-                    report_content += f"\n{row['Assessment Criteria']}:\n{row['Detailed Feedback']}\n"
-                
-                report_content += f"""
-{'-'*60}
-Report Generated: {dt.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Platform: Drishti UPSC Mock Interview System
-© Drishti AI Team
-"""
-                
-                st.download_button(
-                    label="📊 Full Report",
-                    data=report_content,
-                    file_name=f"interview_report_{st.session_state.current_candidate}_{dt.datetime.now().strftime('%Y%m%d')}.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
-            
-            # Transcript viewer
-            if artifact.get("transcript"):
-                with st.expander("📄 View Complete Transcript"):
-                    st.text_area("Interview Transcript", artifact["transcript"], height=400)
-            
-            # Update session status
-            st.session_state.interview_status = "completed"
-            
-    except Exception as e:
-        st.error(f"❌ Error fetching feedback: {e}")
-        st.session_state.interview_status = "error"
+def fetch_latest_call(assistant_id: str) -> Dict[str, Any]:
+    """Fetch full details of an assistant's newest call, if any"""
+    latest_calls = list_calls(assistant_id)
+    return resolve_call_details(latest_calls[0]) if latest_calls else None
+
+def refresh_all_candidates() -> List[Dict[str, str]]:
+    """Fetch every candidate's latest call concurrently and summarize them as table rows"""
+    futures = {
+        roll_no: submit_background(fetch_latest_call, info["assistant_id"])
+        for roll_no, info in st.session_state.assistants.items()
+    }
+    rows = []
+    for roll_no, future in futures.items():
+        row = {"Roll No": roll_no, "Name": st.session_state.assistants[roll_no]["name"], "Status": "No interview yet", "Rating": ""}
+        try:
+            call = future.result()
+        except Exception as e:
+            row["Status"] = f"Error: {e}"
+        else:
+            if call:
+                row["Status"] = call.get("status", "")
+                row["Rating"] = get_success_evaluation(call)[0]
+        rows.append(row)
+    return rows
 
-elif not st.session_state.current_candidate:
-    st.info("Please complete previous steps to view feedback.")
+if len(st.session_state.assistants) > 1:
+    with st.expander("👥 All Candidates"):
+        if st.button("🔄 Refresh All Candidates"):
+            st.session_state.feedback_by_roll_no = refresh_all_candidates()
+        if st.session_state.feedback_by_roll_no:
+            st.dataframe(st.session_state.feedback_by_roll_no, use_container_width=True, hide_index=True)
 
 # Footer
 st.markdown("---")
-st.markdown("""
-<div style="text-align: center; padding: 20px; background: linear-gradient(135deg, #667eea, #764ba2); border-radius: 15px; color: white;">
-    <h4>© Drishti AI Team | Secure UPSC Mock Interview Platform</h4>
-    <p>🔒 All interviews are encrypted and analyzed securely</p>
-    <p>📞 Technical Support: support@drishti.ai</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
@@ -0,0 +1,424 @@
+"""Static prompts, templates and Vapi settings for the AI Mock Interview app"""
+
+import string
+from functools import lru_cache
+from html import escape
+import orjson
+
+# DAF extraction
+DAF_SCHEMA = {
+    "name": "string", "roll_no": "string", "dob": "string", "gender": "string",
+    "community": "string", "religion": "string", "mother_tongue": "string",
+    "birth_place": "string", "home_city": "string", "marital_status": "string",
+    "employment_status": "string", "number_of_attempts": "integer",
+    "service_preferences": "array", "cadre_preferences": "array",
+    "assets": "string", "education": "object", "optional_subject": "string",
+    "language_medium": "string", "hobbies": "array", "achievements": "array",
+    "parents": "object", "address": "object", "email": "string", "phone": "string",
+    "work_experience": "array", "positions_of_responsibility": "array",
+    "extracurriculars": "array", "sports": "array", "certifications": "array",
+    "awards": "array", "languages_known": "array",
+    "preferred_languages_for_interview": "array", "coaching": "string",
+    "career_gap_explanations": "string", "notable_projects": "array",
+    "publications": "array", "social_work": "array", "disciplinary_actions": "string"
+}
+
+DAF_SCHEMA_TEXT = orjson.dumps(DAF_SCHEMA, option=orjson.OPT_INDENT_2).decode()
+
+def build_extraction_prompt(reg_no: str) -> str:
+    """Build the Gemini DAF extraction prompt"""
+    return f"""You are an expert UPSC DAF parser. Extract a single JSON from DAF-1 and DAF-2 following this schema:
+{DAF_SCHEMA_TEXT}
+
+Candidate roll/registration no.: {reg_no or 'UNKNOWN'}
+
+Rules:
+- Return valid JSON only
+- Populate all available fields from the documents
+- If a field is absent, omit it from the JSON
+- Extract detailed information for all arrays and objects"""
+
+# Interview prompt
+@lru_cache(maxsize=64)
+def render_interview_prompt(name: str, roll_no: str, candidate_json_text: str) -> str:
+    """Render the interview prompt, memoized on the serialized candidate JSON"""
+    prompt = f"""[Identity]
+You are a UPSC Interview Board Member conducting the Civil Services Personality Test.
+Role: Senior bureaucrat/academician, neutral and impartial.
+Purpose: To simulate a 30-35 minute UPSC Personality Test Interview for candidate {name} (Roll No: {roll_no}), followed by 5 minutes of feedback.
+
+[Style]
+- Formal, dignified, polite, and probing
+- Neutral and impartial
+- Adaptive: switch roles between Chair and Subject-Matter Experts
+- Build follow-up questions from candidate's answers
+
+[Response Guidelines]
+- Ask one clear question at a time (The question must not be too long)
+- If vague → ask for specifics
+- If fact-only → seek opinion/analysis
+- If hesitant → reassure
+- If extreme view → present counterview
+- Always stay courteous
+- Do be either too positive or too negative
+
+[Interview Flow]
+1) Opening (2 min)
+2) DAF-based Background (8-10 min)
+3) Academic & Optional Subject (8-10 min)
+4) Hobbies, ECAs & Personality (5-7 min)
+5) Current Affairs & Governance (7-8 min)
+6) Closing (2 min)
+7) Feedback (5 min)
+
+[Error Handling]
+- If candidate says "I don't know" accept gracefully
+- If candidate misunderstands politely clarify
+
+[Candidate Information]
+{candidate_json_text}"""
+    
+    return prompt
+
+# Analysis plan for structured feedback
+_VAPI_SUMMARY_MESSAGES = [
+    {
+        "role": "system",
+        "content": "You are an expert note-taker. Summarize the interview call in 2-3 sentences, highlighting key topics/questions asked and candidate's response areas (background, current affairs, ethics, optional subject, hobbies)."
+    },
+    {
+        "role": "user",
+        "content": "Here is the transcript:\n\n{{transcript}}\n\nHere is the ended reason of the call:\n\n{{endedReason}}"
+    }
+]
+
+_VAPI_STRUCTURED_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "clarityOfExpression": {"type": "string"},
+        "reasoningAbility": {"type": "string"},
+        "analyticalDepth": {"type": "string"},
+        "currentAffairsAwareness": {"type": "string"},
+        "ethicalJudgment": {"type": "string"},
+        "personalityTraits": {"type": "string"},
+        "socialAwareness": {"type": "string"},
+        "hobbiesDepth": {"type": "string"},
+        "overallImpression": {"type": "string"},
+        "strengths": {"type": "string"},
+        "areasForImprovement": {"type": "string"},
+        "overallFeedback": {"type": "string"}
+    }
+}
+
+_VAPI_STRUCTURED_MESSAGES = [
+    {
+        "role": "system",
+        "content": f"Extract structured interview performance data. Each field should contain qualitative comments (2-3 sentences max). Output JSON with all fields populated.\n\nSchema:\n{orjson.dumps(_VAPI_STRUCTURED_SCHEMA).decode()}"
+    },
+    {
+        "role": "user",
+        "content": "Here is the transcript:\n\n{{transcript}}\n\nHere is the ended reason of the call:\n\n{{endedReason}}"
+    }
+]
+
+_VAPI_SUCCESS_MESSAGES = [
+    {
+        "role": "system",
+        "content": "Evaluate the interview success based on: 1) Clarity of Expression, 2) Reasoning & Analytical Depth, 3) Current Affairs & Governance Awareness, 4) Ethical & Situational Judgment, 5) Personality Traits & Social Awareness. Provide overall rating: Highly Suitable/Suitable/Borderline/Unsuitable with brief justification."
+    },
+    {
+        "role": "user",
+        "content": "Here is the transcript:\n\n{{transcript}}\n\nHere is the ended reason:\n\n{{endedReason}}\n\nHere was the system prompt:\n\n{{systemPrompt}}"
+    }
+]
+
+VAPI_ANALYSIS_PLAN = {
+    "summaryPlan": {"messages": _VAPI_SUMMARY_MESSAGES},
+    "structuredDataPlan": {
+        "enabled": True,
+        "schema": _VAPI_STRUCTURED_SCHEMA,
+        "messages": _VAPI_STRUCTURED_MESSAGES
+    },
+    "successEvaluationPlan": {
+        "rubric": "DescriptiveScale",
+        "messages": _VAPI_SUCCESS_MESSAGES
+    }
+}
+
+# Static assistant settings; only name, system prompt and metadata vary per candidate
+VAPI_ASSISTANT_DEFAULTS = {
+    "voice": {
+        "provider": "11labs",
+        "model": "eleven_multilingual_v2",
+        "voiceId": "1vSsmMcrftVqwsGrxUMM",
+        "speed": 0.95,
+        "stability": 0.5,
+        "similarityBoost": 0.75
+    },
+    "maxDurationSeconds": 2400,
+    "firstMessage": "Welcome, please be seated. Shall we begin the interview?",
+    "voicemailMessage": "Please call back when you're available.",
+    "endCallMessage": "Thank you for your time. Goodbye.",
+    "transcriber": {
+        "provider": "deepgram",
+        "model": "nova-2",
+        "language": "en"
+    },
+    "analysisPlan": VAPI_ANALYSIS_PLAN
+}
+
+# Interview page
+def minify_html(html: str) -> str:
+    """Strip indentation and blank lines from HTML/CSS/JS source"""
+    return "\n".join(line.strip() for line in html.splitlines() if line.strip())
+
+INTERVIEW_HTML_TEMPLATE = string.Template(minify_html(r"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>UPSC Interview - $candidate_name</title>
+    <style>
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            min-height: 100vh; color: white; padding: 20px;
+        }
+        .container { max-width: 1000px; margin: 0 auto; }
+        .header { text-align: center; margin-bottom: 30px; }
+        .header h1 { font-size: 2.5em; margin-bottom: 10px; text-shadow: 2px 2px 4px rgba(0,0,0,0.3); }
+        .main-panel {
+            background: rgba(255,255,255,0.1); padding: 30px; border-radius: 20px;
+            backdrop-filter: blur(15px); border: 1px solid rgba(255,255,255,0.2);
+            margin-bottom: 20px;
+        }
+        .status-bar {
+            background: rgba(0,0,0,0.4); padding: 15px; border-radius: 10px;
+            text-align: center; margin-bottom: 20px; font-weight: 600; font-size: 16px;
+        }
+        .info-grid { 
+            display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); 
+            gap: 20px; margin: 20px 0; 
+        }
+        .info-card {
+            background: rgba(255,255,255,0.1); padding: 20px; border-radius: 15px;
+            backdrop-filter: blur(10px); border: 1px solid rgba(255,255,255,0.2);
+        }
+        .info-card h3 { color: #fbbf24; margin-bottom: 10px; }
+        .widget-container {
+            background: rgba(255,255,255,0.05); padding: 30px; border-radius: 20px;
+            backdrop-filter: blur(10px); border: 1px solid rgba(255,255,255,0.1);
+            margin: 30px 0; min-height: 400px; position: relative;
+        }
+        .instructions {
+            background: rgba(34, 197, 94, 0.2); border: 2px solid #22c55e;
+            padding: 20px; border-radius: 15px; margin: 20px 0;
+        }
+        .status-indicator {
+            position: absolute; top: 15px; right: 15px; padding: 8px 15px;
+            border-radius: 20px; font-size: 14px; font-weight: 600;
+            background: rgba(59, 130, 246, 0.3); color: #3b82f6;
+        }
+        @keyframes pulse { 0%, 100% { opacity: 1; } 50% { opacity: 0.7; } }
+        .live { animation: pulse 1.5s infinite; background: rgba(239, 68, 68, 0.3); color: #ef4444; }
+        @media (max-width: 768px) {
+            .container { padding: 15px; }
+            .info-grid { grid-template-columns: 1fr; }
+            .header h1 { font-size: 2em; }
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🎤 UPSC Civil Services Interview</h1>
+            <p style="font-size: 1.2em; opacity: 0.9;">Secure HTTPS Interview Platform</p>
+        </div>
+        
+        <div class="status-bar" id="statusBar">
+            🔄 Initializing secure interview system...
+        </div>
+        
+        <div class="main-panel">
+            <div class="info-grid">
+                <div class="info-card">
+                    <h3>📋 Interview Details</h3>
+                    <p><strong>Candidate:</strong> $candidate_name</p>
+                    <p><strong>Roll Number:</strong> $roll_no</p>
+                    <p><strong>Interview Type:</strong> Personality Test</p>
+                    <p><strong>Duration:</strong> 30-35 minutes + feedback</p>
+                </div>
+                
+                <div class="info-card">
+                    <h3>🎯 System Status</h3>
+                    <p><strong>Security:</strong> <span style="color: #22c55e;">HTTPS Enabled ✓</span></p>
+                    <p><strong>Microphone:</strong> <span id="micStatus">Checking...</span></p>
+                    <p><strong>Widget:</strong> <span id="widgetStatus">Loading...</span></p>
+                    <p><strong>Ready:</strong> <span id="readyStatus">Preparing...</span></p>
+                </div>
+            </div>
+            
+            <div class="instructions">
+                <h3>📋 Interview Instructions:</h3>
+                <ul style="margin-left: 20px; margin-top: 10px;">
+                    <li><strong>Microphone:</strong> Allow access when prompted by your browser</li>
+                    <li><strong>Environment:</strong> Quiet room with stable internet connection</li>
+                    <li><strong>Speaking:</strong> Clear, confident delivery at normal pace</li>
+                    <li><strong>Listening:</strong> Pay careful attention to each question</li>
+                    <li><strong>Approach:</strong> Be authentic, think before answering, stay calm</li>
+                </ul>
+            </div>
+            
+            <div class="widget-container">
+                <div class="status-indicator" id="statusIndicator">🔄 Loading</div>
+                
+                <vapi-widget
+                    id="vapiWidget"
+                    public-key="$vapi_public_key"
+                    assistant-id="$assistant_id"
+                    mode="voice"
+                    theme="dark"
+                    base-bg-color="rgba(0,0,0,0.2)"
+                    accent-color="#14B8A6"
+                    cta-button-color="#667eea"
+                    cta-button-text-color="#ffffff"
+                    border-radius="large"
+                    size="full"
+                    position="center"
+                    title="UPSC MOCK INTERVIEW"
+                    start-button-text="🎙️ Begin Interview"
+                    end-button-text="📞 End Interview"
+                    voice-show-transcript="true"
+                    consent-required="true"
+                    consent-title="Interview Consent"
+                    consent-content="By proceeding, I consent to the recording and analysis of this mock interview session for assessment purposes."
+                    consent-storage-key="upsc_interview_consent"
+                ></vapi-widget>
+            </div>
+        </div>
+    </div>
+
+    <script src="https://unpkg.com/@vapi-ai/client-sdk-react/dist/embed/widget.umd.js" async></script>
+    
+    <script>
+        let widgetReady = false;
+        let interviewActive = false;
+        
+        function updateStatus(message, type = 'info') {
+            const statusBar = document.getElementById('statusBar');
+            const indicator = document.getElementById('statusIndicator');
+            const statusEmojis = { 'info': '🔄', 'success': '✅', 'warning': '⚠️', 'error': '❌', 'live': '🔴' };
+            
+            statusBar.innerHTML = `$${statusEmojis[type] || '🔄'} $${message}`;
+            
+            if (type === 'live') {
+                indicator.textContent = '🔴 LIVE';
+                indicator.classList.add('live');
+            } else {
+                indicator.textContent = type === 'success' ? '✅ Ready' : type === 'error' ? '❌ Error' : '🔄 Loading';
+                indicator.classList.remove('live');
+            }
+        }
+        
+        function updateSystemStatus(component, status, isGood = true) {
+            const element = document.getElementById(component + 'Status');
+            if (element) {
+                element.textContent = status;
+                element.style.color = isGood ? '#22c55e' : '#ef4444';
+                element.style.fontWeight = '600';
+            }
+        }
+        
+        async function checkMicrophone() {
+            try {
+                updateSystemStatus('mic', 'Testing...', true);
+                const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+                const tracks = stream.getTracks();
+                
+                if (tracks.length > 0) {
+                    updateSystemStatus('mic', 'Access granted ✓', true);
+                    tracks.forEach(track => track.stop());
+                    return true;
+                }
+            } catch (error) {
+                updateSystemStatus('mic', 'Access needed ✗', false);
+                updateStatus('⚠️ Please allow microphone access when prompted', 'warning');
+                return false;
+            }
+        }
+        
+        function setupWidget() {
+            const widget = document.getElementById('vapiWidget');
+            if (!widget) return;
+            
+            widget.addEventListener('call-start', () => {
+                interviewActive = true;
+                updateStatus('🔴 Interview in progress - Good luck!', 'live');
+                updateSystemStatus('ready', 'Live Interview ✓', true);
+                document.title = '🔴 LIVE: UPSC Interview - ' + $candidate_name_js;
+            });
+            
+            widget.addEventListener('call-end', () => {
+                interviewActive = false;
+                updateStatus('✅ Interview completed successfully', 'success');
+                updateSystemStatus('ready', 'Completed ✓', true);
+                document.title = '✅ Completed: UPSC Interview - ' + $candidate_name_js;
+            });
+            
+            widget.addEventListener('error', () => {
+                interviewActive = false;
+                updateStatus('❌ Technical error - Please refresh and try again', 'error');
+                updateSystemStatus('ready', 'Error ✗', false);
+            });
+            
+            widget.addEventListener('ready', () => {
+                widgetReady = true;
+                updateSystemStatus('widget', 'Loaded ✓', true);
+                updateSystemStatus('ready', 'Ready to start ✓', true);
+                updateStatus('✅ Interview system ready - Click "Begin Interview"', 'success');
+            });
+        }
+        
+        async function initializeSystem() {
+            updateStatus('🔄 Initializing secure interview system...', 'info');
+            
+            await checkMicrophone();
+            
+            setTimeout(() => {
+                setupWidget();
+                updateSystemStatus('widget', 'Initializing...', true);
+                
+                setTimeout(() => {
+                    if (!widgetReady) {
+                        updateStatus('⚠️ Widget loading slowly - please wait', 'warning');
+                    }
+                }, 5000);
+            }, 1000);
+        }
+        
+        window.addEventListener('beforeunload', (event) => {
+            if (interviewActive) {
+                event.preventDefault();
+                event.returnValue = 'Your interview is in progress. Are you sure you want to leave?';
+            }
+        });
+        
+        document.addEventListener('DOMContentLoaded', initializeSystem);
+    </script>
+</body>
+</html>"""))
+
+@lru_cache(maxsize=32)
+def create_interview_html(candidate_name: str, roll_no: str, assistant_id: str, vapi_public_key: str) -> str:
+    """Create complete interview HTML with widget integration"""
+    # Names like "D'Souza" or "A & B" must not break the markup or the inline script;
+    # edited candidate JSON may hold a numeric roll number or a null name, so stringify first
+    candidate_name, roll_no = str(candidate_name), str(roll_no)
+    return INTERVIEW_HTML_TEMPLATE.substitute(
+        candidate_name=escape(candidate_name),
+        candidate_name_js=orjson.dumps(candidate_name).decode().replace("</", "<\\/"),
+        roll_no=escape(roll_no),
+        assistant_id=escape(str(assistant_id)),
+        vapi_public_key=escape(str(vapi_public_key))
+    )